@@ -58,6 +58,8 @@ public function handle()
                         'published_at' => $article['published_at'] ?? now()->toDateTimeString(),
                         'content'      => $content ?: null,
                         'image'        => !empty($article['image']) ? $article['image'] : null,
+                        'image_thumb'  => $article['image_thumb'] ?? null,
+                        'image_card'   => $article['image_card'] ?? null,
                         'category'     => $article['category'] ?? 'General',
                     ]
                 );
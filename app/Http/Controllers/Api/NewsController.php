@@ -13,7 +13,7 @@ public function index(Request $request)
     {
         $pageSize = $request->get('page_size', 10); // default 10
         $news = News::orderBy('published_at', 'desc')
-            ->paginate($pageSize, ['id', 'title', 'description', 'content', 'published_at', 'link', 'image']); 
+            ->paginate($pageSize, ['id', 'title', 'description', 'content', 'published_at', 'link', 'image', 'image_thumb', 'image_card']); 
 
         return response()->json($news);
     }
@@ -16,6 +16,8 @@ class News extends Model
         'published_at',
         'content',
         'image',
+        'image_thumb',
+        'image_card',
         'content',
     ];
 }
@@ -0,0 +1,30 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Resized copies of `image` served by the Python service (thumb for lists, card for detail)
+        Schema::table('news', function (Blueprint $table) {
+            $table->string('image_thumb')->nullable()->after('image');
+            $table->string('image_card')->nullable()->after('image_thumb');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('news', function (Blueprint $table) {
+            $table->dropColumn(['image_thumb', 'image_card']);
+        });
+    }
+};
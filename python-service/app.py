@@ -1,35 +1,50 @@
 # app.py
-from flask import Flask, jsonify, request
-from scraper import get_all_articles
-import threading
-import time
+from flask import Flask, abort, jsonify, request, send_file
+from images import DERIVATIVES, PUBLIC_BASE_URL, attach_images, derivative_path, touch
+from scheduler import Scheduler
+import sink
+from sources import SOURCES
+import os
+import re
 import datetime as dt
 
 app = Flask(__name__)
 
-CACHE_TTL = 1800  # 30 minutes
-_cached = []
-_last_fetch = 0
-_lock = threading.Lock()
+IMAGE_MAX_AGE = 31536000  # derivatives are keyed by source URL, safe to cache for a year
+
+
+def _image_stage(items: list) -> list:
+    try:
+        live, _ = scheduler.snapshot()
+        attach_images(items, live=live)
+    except Exception as e:
+        print("⚠️ image stage error:", e)
+    return items
+
+
+# every source refreshes on its own cadence; see sources.py
+# with NEWS_DB_URL set, new/changed articles are also written straight into the news table
+scheduler = Scheduler(
+    SOURCES,
+    process=_image_stage,
+    on_change=sink.write_articles if sink.enabled() else None,
+)
 
 
 def refresh_cache():
-    global _cached, _last_fetch
     try:
-        data = get_all_articles()
-        with _lock:
-            _cached = data
-            _last_fetch = time.time()
-        print(f"🧠 Cache refreshed: {_last_fetch}, items={len(data)}")
-        return True, len(data)
+        n = scheduler.refresh_all()
+        cached, last = scheduler.snapshot()
+        print(f"🧠 Cache refreshed: {last}, items={len(cached)}, new/changed={n}")
+        return True, len(cached)
     except Exception as e:
         print("❌ refresh_cache error:", e)
         return False, 0
 
 
 def get_cache():
-    with _lock:
-        return list(_cached), _last_fetch
+    scheduler.start()
+    return scheduler.snapshot()
 
 
 @app.route("/saudi-news", methods=["GET"])
@@ -38,9 +53,8 @@ def saudi_news():
     since_q = request.args.get("since")
 
     cached, last = get_cache()
-    now = time.time()
-    if not cached or (now - last) > CACHE_TTL:
-        print("🔄 Cache stale -> refreshing…")
+    if not cached and not last:
+        print("🔄 Cache empty -> refreshing…")
         refresh_cache()
         cached, _ = get_cache()
 
@@ -56,9 +70,36 @@ def saudi_news():
             cutoff_str = sd.strftime("%Y-%m-%d %H:%M:%S")
             cached = [a for a in cached if a.get("published_at", "") > cutoff_str]
 
+    if not PUBLIC_BASE_URL:
+        host = request.host_url.rstrip("/")
+        cached = [_absolute_image_urls(a, host) for a in cached]
+
     return jsonify(cached)
 
 
+def _absolute_image_urls(article: dict, host: str) -> dict:
+    if not any(article.get(f"image_{size}") for size in DERIVATIVES):
+        return article
+    a = dict(article)
+    for size in DERIVATIVES:
+        if a.get(f"image_{size}"):
+            a[f"image_{size}"] = host + a[f"image_{size}"]
+    return a
+
+
+@app.route("/img/<key>/<size>.jpg", methods=["GET"])
+def image_derivative(key, size):
+    if size not in DERIVATIVES or not re.fullmatch(r"[0-9a-f]{40}", key):
+        abort(404)
+    path = derivative_path(key, size)
+    if not os.path.exists(path):
+        abort(404)
+    touch(path)
+    resp = send_file(path, mimetype="image/jpeg", max_age=IMAGE_MAX_AGE, conditional=True)
+    resp.headers["Cache-Control"] = f"public, max-age={IMAGE_MAX_AGE}, immutable"
+    return resp
+
+
 @app.route("/refresh", methods=["POST", "GET"])
 def manual_refresh():
     ok, n = refresh_cache()
@@ -66,6 +107,7 @@ def manual_refresh():
 
 
 if __name__ == "__main__":
-    # First warm-up
+    # First warm-up, then hand over to the per-source schedule
     refresh_cache()
+    scheduler.start()
     app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,248 @@
+# images.py
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from scraper import HEADERS, TIMEOUT, _session
+
+# ---------- CONFIG ----------
+IMAGE_CACHE_DIR = os.environ.get(
+    "IMAGE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "image_cache")
+)
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))  # 200 MB
+IMAGE_MAX_SOURCE_BYTES = 15 * 1024 * 1024  # refuse absurd originals
+IMAGE_WORKERS = 8
+# Public prefix for derivative URLs, e.g. "https://news.example.com". Empty -> relative paths.
+PUBLIC_BASE_URL = os.environ.get("PUBLIC_BASE_URL", "").rstrip("/")
+
+# name -> (max width, max height); aspect ratio is preserved
+DERIVATIVES = {
+    "thumb": (320, 180),
+    "card": (800, 450),
+}
+JPEG_QUALITY = 80
+TMP_PREFIX = ".tmp-"
+TMP_MAX_AGE = 3600  # seconds; older temp files were left behind by a crashed write
+
+_lock = threading.Lock()
+
+
+# ---------- HELPERS ----------
+def image_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _probe_path(key: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, f"{key}.json")
+
+
+def derivative_path(key: str, size: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, f"{key}_{size}.jpg")
+
+
+def derivative_url(key: str, size: str) -> str:
+    return f"{PUBLIC_BASE_URL}/img/{key}/{size}.jpg"
+
+
+def _load_probe(key: str) -> Optional[dict]:
+    path = _probe_path(key)
+    if not os.path.exists(path):
+        return None
+    if not all(os.path.exists(derivative_path(key, s)) for s in DERIVATIVES):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            probe = json.load(f)
+    except Exception:
+        return None
+    # a cache hit counts as a use for LRU eviction
+    touch(path)
+    for s in DERIVATIVES:
+        touch(derivative_path(key, s))
+    return probe
+
+
+def _download(url: str) -> Optional[bytes]:
+    try:
+        r = _session.get(url, timeout=TIMEOUT, headers=HEADERS, stream=True)
+        if r.status_code != 200:
+            return None
+        buf = io.BytesIO()
+        for chunk in r.iter_content(64 * 1024):
+            buf.write(chunk)
+            if buf.tell() > IMAGE_MAX_SOURCE_BYTES:
+                return None
+        return buf.getvalue()
+    except Exception:
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # unique temp name: several sources may process the same image at once
+    fd, tmp = tempfile.mkstemp(dir=IMAGE_CACHE_DIR, prefix=TMP_PREFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _to_rgb(im: Image.Image) -> Image.Image:
+    """Upright RGB copy for JPEG: apply EXIF orientation, flatten transparency onto white."""
+    im = ImageOps.exif_transpose(im)
+    if im.mode == "P" and "transparency" in im.info:
+        im = im.convert("RGBA")
+    if im.mode in ("RGBA", "LA", "PA"):
+        rgba = im.convert("RGBA")
+        bg = Image.new("RGB", im.size, (255, 255, 255))
+        bg.paste(rgba, mask=rgba.getchannel("A"))
+        return bg
+    return im.convert("RGB")
+
+
+# ---------- PROBE / RESIZE ----------
+def process_image(url: str) -> Optional[dict]:
+    """
+    Fetch an article image once, record its dimensions and size,
+    and write the fixed-size derivatives into the disk cache.
+    Returns the probe record, or None if the image could not be used.
+    """
+    if not url:
+        return None
+    try:
+        return _process_image(url)
+    except Exception as e:
+        # one bad image (disk full, odd format) must not cost the batch its images
+        print(f"⚠️ image failed {url}: {e}")
+        return None
+
+
+def _process_image(url: str) -> Optional[dict]:
+    key = image_key(url)
+    cached = _load_probe(key)
+    if cached:
+        return cached
+
+    raw = _download(url)
+    if not raw:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(raw)) as im:
+            im.load()
+            src = _to_rgb(im)
+            width, height = src.size
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return None
+
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    for size, box in DERIVATIVES.items():
+        d = src.copy()
+        d.thumbnail(box, Image.LANCZOS)
+        out = io.BytesIO()
+        d.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        _write_atomic(derivative_path(key, size), out.getvalue())
+
+    probe = {"key": key, "url": url, "width": width, "height": height, "bytes": len(raw)}
+    _write_atomic(_probe_path(key), json.dumps(probe).encode("utf-8"))
+    return probe
+
+
+def evict_cache(max_bytes: int = IMAGE_CACHE_MAX_BYTES, keep: frozenset = frozenset()) -> int:
+    """
+    Delete least-recently-used files until the cache fits in max_bytes.
+    Files of image keys in `keep` (images still in the live snapshot) are never deleted.
+    Temp files may still be in the middle of a write, so they are only
+    removed once older than TMP_MAX_AGE.
+    Returns files removed.
+    """
+    if not os.path.isdir(IMAGE_CACHE_DIR):
+        return 0
+    with _lock:
+        entries = []
+        total = 0
+        removed = 0
+        now = time.time()
+        for name in os.listdir(IMAGE_CACHE_DIR):
+            path = os.path.join(IMAGE_CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if name.startswith(TMP_PREFIX):
+                if now - st.st_mtime > TMP_MAX_AGE:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except OSError:
+                        pass
+                continue
+            total += st.st_size
+            if name.split("_")[0].split(".")[0] in keep:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        if total <= max_bytes:
+            return removed
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def touch(path: str) -> None:
+    """Mark a cache file as recently used (mtime drives LRU eviction)."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def attach_images(articles: list, live: Optional[list] = None) -> list:
+    """
+    Add image dimensions/bytes and derivative URLs to each article in place.
+    `live` is the current snapshot; its images are protected from eviction.
+    """
+    urls = {a["image"] for a in articles if a.get("image")}
+    if not urls:
+        return articles
+
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as pool:
+        probes = dict(zip(urls, pool.map(process_image, urls)))
+
+    done = 0
+    for a in articles:
+        probe = probes.get(a.get("image"))
+        if not probe:
+            continue
+        a["image_width"] = probe["width"]
+        a["image_height"] = probe["height"]
+        a["image_bytes"] = probe["bytes"]
+        for size in DERIVATIVES:
+            a[f"image_{size}"] = derivative_url(probe["key"], size)
+        done += 1
+
+    keep = frozenset(image_key(a["image"]) for a in (live or []) + articles if a.get("image"))
+    removed = evict_cache(keep=keep)
+    print(f"🖼️ Images: {done}/{len(articles)} with derivatives, evicted={removed}")
+    return articles
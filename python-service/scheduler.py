@@ -0,0 +1,186 @@
+# scheduler.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from scraper import merge_articles
+from sources import Source
+
+
+class Scheduler:
+    """
+    Runs every source on its own thread and cadence, merging each result
+    into one live snapshot (deduped by link, newest first, DAYS_BACK window).
+    """
+
+    def __init__(
+        self,
+        sources: list,
+        process: Optional[Callable[[list], list]] = None,
+        on_change: Optional[Callable[[list], object]] = None,
+    ):
+        self.sources = sorted(sources, key=lambda s: s.priority)
+        self._process = process      # post-fetch stage run on new/changed articles after they go live
+        self._on_change = on_change  # called with the new/changed articles after each merge
+        self._articles = {}      # link -> article
+        self._owner = {}         # link -> priority of the source that supplied it
+        self._snapshot = []
+        self._last_update = 0.0
+        self._unsunk = set()     # links changed since on_change last succeeded for them
+        self._lock = threading.Lock()
+        self._sink_lock = threading.Lock()
+        self._running = {s.name: threading.Lock() for s in self.sources}
+        self._wake = {s.name: threading.Event() for s in self.sources}
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ---------- SNAPSHOT ----------
+    def snapshot(self):
+        with self._lock:
+            return list(self._snapshot), self._last_update
+
+    def merge(self, source: Source, items: list) -> list:
+        """Upsert a source's items into the snapshot. Returns the new/changed articles."""
+        changed = []
+        with self._lock:
+            for a in items:
+                link = a.get("link")
+                if not link:
+                    continue
+                owner = self._owner.get(link)
+                if owner is not None and owner < source.priority:
+                    continue
+                self._owner[link] = source.priority
+                old = self._articles.get(link)
+                if old is not None and all(old.get(k) == v for k, v in a.items()):
+                    continue  # unchanged; keeps any fields the process stage added
+                changed.append(a)
+                self._articles[link] = a
+
+            merged = merge_articles(list(self._articles.values()))
+            live = {a["link"] for a in merged}
+            self._articles = {a["link"]: a for a in merged}
+            self._owner = {k: v for k, v in self._owner.items() if k in live}
+            self._snapshot = merged
+            self._last_update = time.time()
+        return changed
+
+    # ---------- RUNNING ----------
+    def run_source(self, source: Source) -> int:
+        guard = self._running[source.name]
+        if not guard.acquire(blocking=False):
+            return 0  # previous run (possibly a timed-out fetch) still in flight
+
+        result = {}
+        state = {"finished": False, "abandoned": False}
+        state_lock = threading.Lock()
+
+        def work():
+            try:
+                result["items"] = source.fetch()
+            except Exception as e:
+                print(f"⚠️ {source.name} error:", e)
+            finally:
+                with state_lock:
+                    state["finished"] = True
+                    if state["abandoned"]:
+                        guard.release()  # the run gave up on us; free the source now that we are done
+
+        # the timeout covers the upstream fetch only; a timed-out worker cannot be killed,
+        # so it keeps the source guard until it returns and its result is dropped
+        try:
+            t = threading.Thread(target=work, name=f"fetch-{source.name}", daemon=True)
+            t.start()
+        except Exception:
+            guard.release()
+            raise
+        t.join(source.timeout)
+        with state_lock:
+            if not state["finished"]:
+                state["abandoned"] = True
+                print(f"⏱️ {source.name}: timed out after {source.timeout}s")
+                return 0
+
+        try:
+            if "items" not in result:
+                return 0
+            return self._ingest(source, result["items"])
+        finally:
+            guard.release()
+
+    def _ingest(self, source: Source, items: list) -> int:
+        # merge first so fresh articles go live without waiting on the process stage
+        changed = {a["link"] for a in self.merge(source, items)}
+        if changed and self._process:
+            try:
+                fresh = [dict(a) for a in items if a.get("link") in changed]
+                changed |= {a["link"] for a in self.merge(source, self._process(fresh))}
+            except Exception as e:
+                print(f"⚠️ {source.name} process error:", e)
+
+        with self._lock:
+            live = len(self._snapshot)
+            if self._on_change:
+                self._unsunk |= {k for k in changed if k in self._articles}
+        self._flush(source)
+        print(f"🔁 {source.name}: {len(items)} fetched, {len(changed)} new/changed, live={live}")
+        return len(changed)
+
+    def _flush(self, source: Source) -> None:
+        """Hand every not-yet-persisted article to on_change; failed ones are retried next run."""
+        if not self._on_change:
+            return
+        # never wait on another source's write: a slow sink must not hold up refreshes,
+        # and whatever this run changed stays in _unsunk for the next flush
+        if not self._sink_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._unsunk &= self._articles.keys()  # expired articles no longer need writing
+                pending = [self._articles[k] for k in self._unsunk]
+            if not pending:
+                return
+            try:
+                self._on_change(pending)
+            except Exception as e:
+                print(f"⚠️ {source.name} on_change error ({len(pending)} pending, will retry):", e)
+                return
+            with self._lock:
+                # only clear links whose article has not changed again while we were writing
+                self._unsunk -= {a["link"] for a in pending if self._articles.get(a["link"]) is a}
+        finally:
+            self._sink_lock.release()
+
+    def refresh_all(self) -> int:
+        """Run every source once, in parallel, and wait for all of them."""
+        with ThreadPoolExecutor(max_workers=len(self.sources) or 1) as pool:
+            return sum(pool.map(self.run_source, self.sources))
+
+    def run_now(self, name: Optional[str] = None) -> None:
+        for s in self.sources:
+            if name is None or s.name == name:
+                self._wake[s.name].set()
+
+    def _loop(self, source: Source) -> None:
+        wake = self._wake[source.name]
+        while not self._stop.is_set():
+            wake.wait(source.next_delay())
+            wake.clear()
+            if self._stop.is_set():
+                break
+            self.run_source(source)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for s in self.sources:
+                t = threading.Thread(target=self._loop, args=(s,), name=f"source-{s.name}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self) -> None:
+        self._stop.set()
+        for ev in self._wake.values():
+            ev.set()
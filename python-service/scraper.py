@@ -7,7 +7,7 @@ from urllib.parse import urljoin, urlparse, urlunparse
 
 import feedparser
 import requests
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
 from dateutil import parser as dateparser
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -178,123 +178,227 @@ def _try_resolve_twitter_image(url: str, timeout: int = 4) -> Optional[str]:
 
 
 # ---------- CONTENT CLEANING ----------
-def clean_article_content(html_text: str, base_url: str = "") -> str:
+# dropped outright, together with everything inside them
+_DROP_TAGS = frozenset(["script", "style", "noscript", "aside"])
+# likely related/recommendation blocks, matched by class
+_RELATED_CLASSES = frozenset([
+    "related", "related-articles", "more-like-this",
+    "recommended", "o-media-pod__summary", "widget-related",
+    "related-content", "related-posts", "sp-related", "more-on",
+    "promo", "inline-promo",
+])
+# page chrome, dropped unless it holds at least 60 chars of text
+_CHROME_TAGS = frozenset(["header", "footer", "nav"])
+_MEDIA_TAGS = frozenset(["img", "iframe"])
+_KEEP_TAGS = frozenset(["img", "iframe", "video"])
+_PLAIN_STRINGS = (NavigableString, CData)
+
+# plain text occurrences like "pic.twitter.com/..." or "https://t.co/..."
+_TEXT_URL_RE = re.compile(r'(https?://\S*pic\.twitter\.com/\S+|https?://\S*t\.co/\S+|pic\.twitter\.com/\S+|t\.co/\S+)', flags=re.IGNORECASE)
+
+
+def _has_text(tag: Tag, string_types: set) -> bool:
     """
-    Clean article HTML:
-    - Remove scripts/styles
-    - Remove related/recommendation blocks
-    - Convert twitter pic links to inline <img> when resolvable, otherwise insert twitter blockquote
-    - Convert twitter/t.co links to blockquote
-    - Remove empty tags
-    Return HTML string.
+    Equivalent of bool(tag.get_text(strip=True)), given the set of string classes
+    with non-blank text below the tag. get_text() only counts the classes in
+    tag.interesting_string_types, e.g. <rt> only sees its own RubyTextString.
     """
-    soup = BeautifulSoup(html_text or "", "html.parser")
-
-    # remove scripts/styles
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-
-    # remove likely related/recommendations by class or role
-    related_selectors = [
-        "aside", ".related", ".related-articles", ".more-like-this",
-        ".recommended", ".o-media-pod__summary", ".widget-related",
-        ".related-content", ".related-posts", ".sp-related", ".more-on",
-        ".promo", ".inline-promo"
-    ]
-    for sel in related_selectors:
-        for node in soup.select(sel):
-            node.decompose()
-
-    # remove empty header/footer
-    for node in soup.select("header, footer, nav"):
-        # if they are long / not content-like, remove them
-        if not node.get_text(strip=True) or len(node.get_text(strip=True)) < 60:
-            node.decompose()
+    wanted = tag.interesting_string_types
+    if wanted is None:
+        return bool(string_types)
+    if isinstance(wanted, type):
+        return wanted in string_types
+    return any(t in string_types for t in wanted)
+
+
+def _tweet_blockquote(soup: BeautifulSoup, url: str) -> Tag:
+    blockquote = soup.new_tag("blockquote", **{"class": "twitter-tweet"})
+    link_tag = soup.new_tag("a", href=url)
+    link_tag.string = url
+    blockquote.append(link_tag)
+    return blockquote
+
+
+def _rewrite_anchor(soup: BeautifulSoup, a: Tag, base_url: str) -> Optional[Tag]:
+    """Embed twitter links in place of the anchor, or normalize it. Returns the replacement, if any."""
+    href_raw = a["href"].strip()
+    href = urljoin(base_url, href_raw) if base_url else href_raw
+
+    # handle pic.twitter.com -> try to resolve to image and embed
+    if "pic.twitter.com" in href or re.search(r'pic\.twitter\.com/\w+', href):
+        img_url = _try_resolve_twitter_image(href)
+        new = soup.new_tag("img", src=img_url) if img_url else _tweet_blockquote(soup, href)
+        a.replace_with(new)
+        return new
+
+    # twitter/t.co links -> embed as blockquote (tweet)
+    if "twitter.com" in href or "t.co/" in href:
+        new = _tweet_blockquote(soup, href)
+        a.replace_with(new)
+        return new
+
+    # otherwise normalize anchor
+    a["href"] = href
+    a["target"] = "_blank"
+    a["rel"] = "noopener noreferrer nofollow"
+    return None
 
-    # process all anchor tags
-    for a in list(soup.find_all("a", href=True)):
-        href_raw = a["href"].strip()
-        href = urljoin(base_url, href_raw) if base_url else href_raw
 
-        # handle pic.twitter.com -> try to resolve to image and embed
-        if "pic.twitter.com" in href or re.search(r'pic\.twitter\.com/\w+', href):
-            img_url = _try_resolve_twitter_image(href)
+def _expand_text_urls(soup: BeautifulSoup, string_node: NavigableString) -> list:
+    """
+    Replace a string holding twitter URLs with images/tweet blockquotes.
+    The new nodes go after the string's *parent*, as they always have. Returns them.
+    """
+    parent: Tag = string_node.parent if isinstance(string_node.parent, Tag) else None
+    if not parent:
+        return []
+    new_children = []
+    for part in _TEXT_URL_RE.split(str(string_node)):
+        if not part:
+            continue
+        if _TEXT_URL_RE.match(part):
+            url_candidate = part
+            if not url_candidate.startswith("http"):
+                url_candidate = "https://" + url_candidate
+            img_url = _try_resolve_twitter_image(url_candidate) if "pic.twitter.com" in url_candidate else None
             if img_url:
-                img_tag = soup.new_tag("img", src=img_url)
-                a.replace_with(img_tag)
+                new_children.append(soup.new_tag("img", src=img_url))
             else:
-                blockquote = soup.new_tag("blockquote", **{"class": "twitter-tweet"})
-                link_tag = soup.new_tag("a", href=href)
-                link_tag.string = href
-                blockquote.append(link_tag)
-                a.replace_with(blockquote)
-            continue
+                new_children.append(_tweet_blockquote(soup, url_candidate))
+        else:
+            new_children.append(NavigableString(part))
+    # replace the string_node with new elements
+    for new_el in reversed(new_children):
+        parent.insert_after(new_el)
+    string_node.extract()
+    return new_children
 
-        # twitter/t.co links -> embed as blockquote (tweet)
-        if "twitter.com" in href or "t.co/" in href:
-            blockquote = soup.new_tag("blockquote", **{"class": "twitter-tweet"})
-            link_tag = soup.new_tag("a", href=href)
-            link_tag.string = href
-            blockquote.append(link_tag)
-            a.replace_with(blockquote)
+
+def _strip_blocks(soup: BeautifulSoup) -> None:
+    """
+    First walk: remove scripts/styles, related blocks, and header/footer/nav
+    with under 60 chars of text. A chrome block is judged on its text before any
+    nested chrome is removed, so lengths are passed up the stack unchanged.
+    """
+    stack = [[soup, list(soup.contents), 0, 0]]  # node, children, next child, text length
+    while stack:
+        frame = stack[-1]
+        node, children, i, _ = frame
+        if i < len(children):
+            frame[2] += 1
+            child = children[i]
+            if isinstance(child, Tag):
+                classes = child.get("class") or ()
+                if child.name in _DROP_TAGS or any(c in _RELATED_CLASSES for c in classes):
+                    child.decompose()
+                else:
+                    stack.append([child, list(child.contents), 0, 0])
+            elif type(child) in _PLAIN_STRINGS:
+                frame[3] += len(child.strip())
             continue
+        stack.pop()
+        if stack:
+            stack[-1][3] += frame[3]
+        if node.name in _CHROME_TAGS and frame[3] < 60:
+            node.decompose()
 
-        # otherwise normalize anchor
-        a["href"] = href
-        a["target"] = "_blank"
-        a["rel"] = "noopener noreferrer nofollow"
 
-    # catch plain text occurrences like "pic.twitter.com/..." or "https://t.co/..."
-    text_url_re = re.compile(r'(https?://\S*pic\.twitter\.com/\S+|https?://\S*t\.co/\S+|pic\.twitter\.com/\S+|t\.co/\S+)', flags=re.IGNORECASE)
-    for string_node in list(soup.find_all(string=text_url_re)):
-        parent: Tag = string_node.parent if isinstance(string_node.parent, Tag) else None
-        if not parent:
-            continue
-        text = str(string_node)
-        parts = text_url_re.split(text)
-        new_children = []
-        for part in parts:
-            if not part:
+def _embed_and_prune(soup: BeautifulSoup, base_url: str) -> None:
+    """
+    Second walk, over what survived _strip_blocks: rewrite links, expand twitter
+    URLs in text, and remove tags with no text and no media.
+    Emptiness is decided on the tree as it stands before anything is pruned,
+    which is what checking each tag top-down with get_text()/find() did.
+    """
+    prune = []
+
+    def summarize(tag: Tag):
+        # (string classes with text, has img/iframe below) for a tag; used for new subtrees
+        types, media = set(), False
+        for c in tag.contents:
+            if isinstance(c, Tag):
+                t, m = summarize(c)
+                types |= t
+                media = media or m or c.name in _MEDIA_TAGS
+            elif c.strip():
+                types.add(type(c))
+        decide(tag, types, media)
+        return types, media
+
+    def decide(tag: Tag, types: set, media: bool) -> None:
+        if tag.name not in _KEEP_TAGS and not media and not _has_text(tag, types):
+            prune.append(tag)
+
+    def add(frame, types: set, media: bool) -> None:
+        frame[3] |= types
+        frame[4] = frame[4] or media
+
+    def add_new(frame, nodes: list) -> None:
+        # tags created during the walk; new strings are picked up from contents
+        for n in nodes:
+            if isinstance(n, Tag):
+                types, media = summarize(n)
+                add(frame, types, media or n.name in _MEDIA_TAGS)
+
+    stack = [[soup, list(soup.contents), 0, set(), False]]  # node, children, next child, types, media
+    while stack:
+        frame = stack[-1]
+        node, children, i = frame[0], frame[1], frame[2]
+        if i < len(children):
+            frame[2] += 1
+            child = children[i]
+            if not isinstance(child, Tag):
                 continue
-            m = text_url_re.match(part)
-            if m:
-                url_candidate = part
-                if not url_candidate.startswith("http"):
-                    url_candidate = "https://" + url_candidate
-                if "pic.twitter.com" in url_candidate:
-                    img_url = _try_resolve_twitter_image(url_candidate)
-                    if img_url:
-                        new_children.append(soup.new_tag("img", src=img_url))
-                    else:
-                        bq = soup.new_tag("blockquote", **{"class": "twitter-tweet"})
-                        a_tag = soup.new_tag("a", href=url_candidate)
-                        a_tag.string = url_candidate
-                        bq.append(a_tag)
-                        new_children.append(bq)
-                else:
-                    bq = soup.new_tag("blockquote", **{"class": "twitter-tweet"})
-                    a_tag = soup.new_tag("a", href=url_candidate)
-                    a_tag.string = url_candidate
-                    bq.append(a_tag)
-                    new_children.append(bq)
-            else:
-                new_children.append(NavigableString(part))
-        # replace the string_node with new elements
-        for new_el in reversed(new_children):
-            parent.insert_after(new_el)
-        string_node.extract()
-
-    # remove nodes that are now empty
-    for tag in list(soup.find_all()):
-        # keep images if present in tag
-        if tag.name in ("img", "iframe", "video"):
+            if child.name == "a" and child.get("href") is not None:
+                new = _rewrite_anchor(soup, child, base_url)
+                if new is not None:
+                    # the old anchor's contents are gone; only the embed needs walking
+                    link = new.a
+                    if link is not None and _TEXT_URL_RE.search(link.string):
+                        _expand_text_urls(soup, link.string)
+                    add_new(frame, [new])
+                    continue
+            stack.append([child, list(child.contents), 0, set(), False])
             continue
-        # remove tags with no text and no media
-        if not tag.get_text(strip=True) and not tag.find("img") and not tag.find("iframe"):
-            try:
-                tag.decompose()
-            except Exception:
-                pass
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        for c in list(node.contents):
+            if isinstance(c, NavigableString) and _TEXT_URL_RE.search(c):
+                inserted = _expand_text_urls(soup, c)
+                if parent is not None:
+                    add_new(parent, inserted)
+
+        types, media = frame[3], frame[4]
+        for c in node.contents:
+            if not isinstance(c, Tag) and c.strip():
+                types.add(type(c))
+        if parent is None:
+            break
+        decide(node, types, media)
+        add(parent, types, media or node.name in _MEDIA_TAGS)
+
+    for tag in prune:
+        if not tag.decomposed:
+            tag.decompose()
+
+
+def clean_article_content(html_text: str, base_url: str = "") -> str:
+    """
+    Clean article HTML:
+    - Remove scripts/styles
+    - Remove related/recommendation blocks
+    - Convert twitter pic links to inline <img> when resolvable, otherwise insert twitter blockquote
+    - Convert twitter/t.co links to blockquote
+    - Remove empty tags
+    Return HTML string.
+
+    Runs as two linear walks: removal first, so twitter links inside removed
+    blocks are never resolved, then link rewriting and empty-tag pruning.
+    """
+    soup = BeautifulSoup(html_text or "", "html.parser")
+    _strip_blocks(soup)
+    _embed_and_prune(soup, base_url)
 
     # final HTML
     cleaned = str(soup).strip()
@@ -421,72 +525,82 @@ def detect_category(title: str = "", content: str = "", entry=None, article_soup
 
 
 # ---------- FETCHERS ----------
-def fetch_rss_articles() -> list:
+def fetch_feed(feed_url: str, seen: Optional[set] = None, timeout: int = TIMEOUT) -> list:
     out = []
     cutoff = _cutoff()
-    seen = set()
+    seen = set() if seen is None else seen
 
-    for feed_url in FEEDS:
-        try:
-            feed = feedparser.parse(feed_url)
-        except Exception as e:
-            print(f"❌ Failed to parse {feed_url}: {e}")
+    try:
+        # fetch through the shared session so the timeout applies; feedparser has none of its own
+        r = _session.get(feed_url, timeout=timeout, headers=HEADERS)
+        feed = feedparser.parse(r.content)
+    except Exception as e:
+        print(f"❌ Failed to parse {feed_url}: {e}")
+        return out
+
+    for entry in getattr(feed, "entries", []):
+        title_raw = getattr(entry, "title", "") or ""
+        # prefer 'content' field if present
+        desc = ""
+        if getattr(entry, "content", None):
+            try:
+                # entry.content is often a list of dicts
+                content_list = entry.content
+                if isinstance(content_list, (list, tuple)) and len(content_list) > 0:
+                    desc = content_list[0].value or content_list[0].get("value", "") or ""
+            except Exception:
+                desc = ""
+        if not desc:
+            desc = getattr(entry, "summary", "") or getattr(entry, "description", "") or ""
+
+        link = (getattr(entry, "link", "") or getattr(entry, "guid", "") or "").replace("&amp;", "&")
+        if not link or not title_raw:
             continue
 
-        for entry in getattr(feed, "entries", []):
-            title_raw = getattr(entry, "title", "") or ""
-            # prefer 'content' field if present
-            desc = ""
-            if getattr(entry, "content", None):
-                try:
-                    # entry.content is often a list of dicts
-                    content_list = entry.content
-                    if isinstance(content_list, (list, tuple)) and len(content_list) > 0:
-                        desc = content_list[0].value or content_list[0].get("value", "") or ""
-                except Exception:
-                    desc = ""
-            if not desc:
-                desc = getattr(entry, "summary", "") or getattr(entry, "description", "") or ""
-
-            link = (getattr(entry, "link", "") or getattr(entry, "guid", "") or "").replace("&amp;", "&")
-            if not link or not title_raw:
-                continue
+        if not is_relevant(title_raw + " " + desc):
+            continue
 
-            if not is_relevant(title_raw + " " + desc):
-                continue
+        published_raw = getattr(entry, "published", None) or getattr(entry, "updated", None)
+        d = parse_date_safe(published_raw) or _now()
+        if d < cutoff:
+            continue
 
-            published_raw = getattr(entry, "published", None) or getattr(entry, "updated", None)
-            d = parse_date_safe(published_raw) or _now()
-            if d < cutoff:
-                continue
+        image_url = None
+        for field in ("media_content", "media_thumbnail", "enclosures"):
+            val = getattr(entry, field, None)
+            if val and isinstance(val, (list, tuple)) and len(val) > 0:
+                d0 = val[0]
+                if isinstance(d0, dict) and d0.get("url"):
+                    image_url = d0["url"]
+                    break
+
+        key = normalize_url(link)
+        if key in seen:
+            continue
+        seen.add(key)
 
-            image_url = None
-            for field in ("media_content", "media_thumbnail", "enclosures"):
-                val = getattr(entry, field, None)
-                if val and isinstance(val, (list, tuple)) and len(val) > 0:
-                    d0 = val[0]
-                    if isinstance(d0, dict) and d0.get("url"):
-                        image_url = d0["url"]
-                        break
-
-            key = normalize_url(link)
-            if key in seen:
-                continue
-            seen.add(key)
+        raw_html = f"<div>{desc}</div>"
+        content = clean_article_content(raw_html, base_url=link)
 
-            raw_html = f"<div>{desc}</div>"
-            content = clean_article_content(raw_html, base_url=link)
+        category = detect_category(title_raw, content, entry=entry)
 
-            category = detect_category(title_raw, content, entry=entry)
+        out.append({
+            "title": clean_title(title_raw),
+            "link": normalize_url(link),
+            "published_at": fmt(d),
+            "content": content,
+            "image": image_url,
+            "category": category or "General",
+        })
+
+    return out
 
-            out.append({
-                "title": clean_title(title_raw),
-                "link": normalize_url(link),
-                "published_at": fmt(d),
-                "content": content,
-                "image": image_url,
-                "category": category or "General",
-            })
+
+def fetch_rss_articles() -> list:
+    out = []
+    seen = set()
+    for feed_url in FEEDS:
+        out.extend(fetch_feed(feed_url, seen))
 
     print(f"📰 RSS: {len(out)} items (last {DAYS_BACK} days)")
     return out
@@ -608,18 +722,8 @@ def scrape_spl_official(max_articles: int = 50) -> list:
     return out
 
 
-def get_all_articles() -> list:
-    items = []
-    try:
-        items.extend(scrape_spl_official(max_articles=120))
-    except Exception as e:
-        print("⚠️ SPL scrape error:", e)
-
-    try:
-        items.extend(fetch_rss_articles())
-    except Exception as e:
-        print("⚠️ RSS scrape error:", e)
-
+def merge_articles(items: list) -> list:
+    """Drop items outside the DAYS_BACK window, dedupe by link (first wins), newest first."""
     cutoff = _cutoff()
     filtered = []
     seen = set()
@@ -634,5 +738,21 @@ def get_all_articles() -> list:
             continue
 
     filtered.sort(key=lambda x: x["published_at"], reverse=True)
+    return filtered
+
+
+def get_all_articles() -> list:
+    items = []
+    try:
+        items.extend(scrape_spl_official(max_articles=120))
+    except Exception as e:
+        print("⚠️ SPL scrape error:", e)
+
+    try:
+        items.extend(fetch_rss_articles())
+    except Exception as e:
+        print("⚠️ RSS scrape error:", e)
+
+    filtered = merge_articles(items)
     print(f"✅ Final: {len(filtered)} items (merged, deduped, sorted)")
     return filtered
@@ -0,0 +1,76 @@
+# sources.py
+import random
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlparse
+
+from scraper import FEEDS, TIMEOUT, fetch_feed, scrape_spl_official
+
+
+@dataclass
+class Source:
+    name: str
+    fetch: Callable[[], list]
+    interval: int          # seconds between runs
+    jitter: int = 0        # +/- seconds added to each interval
+    timeout: int = 120     # seconds before a run is abandoned
+    priority: int = 10     # lower wins when two sources return the same link
+
+    def next_delay(self) -> float:
+        return max(1.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+
+SOURCES = []
+
+
+def register_source(source: Source) -> Source:
+    if any(s.name == source.name for s in SOURCES):
+        raise ValueError(f"source already registered: {source.name}")
+    SOURCES.append(source)
+    return source
+
+
+def _feed(url: str, timeout: int) -> Callable[[], list]:
+    return lambda: fetch_feed(url, timeout=timeout)
+
+
+# ---------- REGISTERED SOURCES ----------
+# The official SPL crawl is slow and changes rarely; the RSS feeds are cheap and fast-moving.
+register_source(Source(
+    name="spl", fetch=lambda: scrape_spl_official(max_articles=120),
+    interval=3600, jitter=300, timeout=600, priority=0,
+))
+
+# host -> (label, interval, jitter, timeout, priority); unknown hosts get the default.
+# The label only prefixes the source name: several feeds may share a host.
+FEED_CADENCES = {
+    "www.goal.com": ("goal", 300, 30, 60, 1),
+    "feeds.bbci.co.uk": ("bbc", 300, 30, 60, 1),
+    "www.arabnews.com": ("arabnews", 600, 60, 90, 2),
+    "onefootball.com": ("onefootball", 600, 60, 90, 2),
+}
+DEFAULT_FEED_CADENCE = (None, 900, 90, 90, 5)
+
+
+def feed_sources(feeds: list) -> list:
+    """One Source per feed URL; a second feed from the same host gets a -2, -3, ... suffix."""
+    out = []
+    used = {s.name for s in SOURCES}
+    for url in feeds:
+        host = urlparse(url).netloc
+        label, interval, jitter, timeout, priority = FEED_CADENCES.get(host, DEFAULT_FEED_CADENCE)
+        name = base = label or host
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{base}-{n}"
+        used.add(name)
+        out.append(Source(
+            name=name, fetch=_feed(url, min(TIMEOUT * 2, timeout)),
+            interval=interval, jitter=jitter, timeout=timeout, priority=priority,
+        ))
+    return out
+
+
+for _source in feed_sources(FEEDS):
+    register_source(_source)
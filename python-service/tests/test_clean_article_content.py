@@ -0,0 +1,84 @@
+# test_clean_article_content.py
+"""
+Byte-for-byte regression guard for scraper.clean_article_content.
+
+The *.expected.html goldens and the "expected" entries of generated.json were
+produced by the pre-rewrite clean_article_content (the per-element
+get_text()/find() version), with _try_resolve_twitter_image replaced by
+fake_resolve below. Regenerate them only for an intended change in output.
+
+Run from python-service/:  python -m unittest discover tests
+"""
+import json
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import scraper  # noqa: E402
+
+FIXTURES = os.path.join(HERE, "fixtures", "clean")
+BASE_URL = "https://www.spl.com.sa/en/news/1"
+
+
+def fake_resolve(url: str, timeout: int = 4):
+    """Deterministic stand-in for the network lookup: even-length URLs resolve to an image."""
+    return f"https://pbs.twimg.com/media/{len(url)}.jpg" if len(url) % 2 == 0 else None
+
+
+class CleanArticleContentTest(unittest.TestCase):
+    def setUp(self):
+        self.resolved = []
+        self._orig = scraper._try_resolve_twitter_image
+
+        def resolve(url, timeout=4):
+            self.resolved.append(url)
+            return fake_resolve(url, timeout)
+
+        scraper._try_resolve_twitter_image = resolve
+
+    def tearDown(self):
+        scraper._try_resolve_twitter_image = self._orig
+
+    def test_fixture_files(self):
+        names = sorted(n[:-5] for n in os.listdir(FIXTURES) if n.endswith(".html") and not n.endswith(".expected.html"))
+        self.assertTrue(names)
+        for name in names:
+            with self.subTest(fixture=name):
+                with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as f:
+                    html = f.read()
+                with open(os.path.join(FIXTURES, f"{name}.expected.html"), encoding="utf-8") as f:
+                    expected = f.read()
+                self.assertEqual(scraper.clean_article_content(html, base_url=BASE_URL), expected)
+
+    def test_generated_corpus(self):
+        with open(os.path.join(FIXTURES, "generated.json"), encoding="utf-8") as f:
+            cases = json.load(f)
+        for i, case in enumerate(cases):
+            with self.subTest(case=i):
+                if "raises" in case:
+                    # twitter URLs in top-level text: insert_after() on the soup itself
+                    with self.assertRaises(NotImplementedError):
+                        scraper.clean_article_content(case["html"], base_url=case["base_url"])
+                else:
+                    got = scraper.clean_article_content(case["html"], base_url=case["base_url"])
+                    self.assertEqual(got, case["expected"])
+
+    def test_no_lookup_inside_removed_chrome(self):
+        html = (
+            '<div><header><a href="https://pic.twitter.com/abc">x</a></header>'
+            '<nav>pic.twitter.com/qq</nav><p>body pic.twitter.com/zz</p></div>'
+        )
+        scraper.clean_article_content(html)
+        self.assertEqual(self.resolved, ["https://pic.twitter.com/zz"])
+
+    def test_no_lookup_inside_replaced_anchor(self):
+        html = '<div><a href="https://t.co/outer"><a href="https://pic.twitter.com/inner">x</a></a></div>'
+        scraper.clean_article_content(html)
+        self.assertEqual(self.resolved, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
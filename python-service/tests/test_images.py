@@ -0,0 +1,97 @@
+# test_images.py
+"""
+Derivative conversion and cache eviction in images.py.
+
+Run from python-service/:  python -m unittest discover tests
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from PIL import Image  # noqa: E402
+
+import images  # noqa: E402
+
+WHITE = (255, 255, 255)
+
+
+class ToRgbTest(unittest.TestCase):
+    def test_transparent_rgba_becomes_white(self):
+        im = Image.new("RGBA", (4, 4), (0, 0, 0, 0))
+        im.putpixel((1, 1), (200, 10, 10, 255))
+        out = images._to_rgb(im)
+        self.assertEqual(out.mode, "RGB")
+        self.assertEqual(out.getpixel((0, 0)), WHITE)
+        self.assertEqual(out.getpixel((1, 1)), (200, 10, 10))
+
+    def test_transparent_la_becomes_white(self):
+        im = Image.new("LA", (2, 2), (0, 0))
+        self.assertEqual(images._to_rgb(im).getpixel((0, 0)), WHITE)
+
+    def test_palette_transparency_becomes_white(self):
+        im = Image.new("P", (2, 2), 0)
+        im.putpalette([0, 0, 0, 255, 0, 0] + [0] * 762)
+        im.putpixel((1, 1), 1)
+        im.info["transparency"] = 0
+        out = images._to_rgb(im)
+        self.assertEqual(out.getpixel((0, 0)), WHITE)
+        self.assertEqual(out.getpixel((1, 1)), (255, 0, 0))
+
+    def test_exif_orientation_applied(self):
+        buf = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 CW on display
+        Image.new("RGB", (40, 20), (10, 20, 30)).save(buf, "JPEG", exif=exif)
+        with Image.open(io.BytesIO(buf.getvalue())) as im:
+            im.load()
+            out = images._to_rgb(im)
+        self.assertEqual(out.size, (20, 40))
+
+
+class EvictCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._orig = images.IMAGE_CACHE_DIR
+        self.tmp = tempfile.TemporaryDirectory()
+        images.IMAGE_CACHE_DIR = self.tmp.name
+
+    def tearDown(self):
+        images.IMAGE_CACHE_DIR = self._orig
+        self.tmp.cleanup()
+
+    def _file(self, name: str, age: float = 0) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        t = time.time() - age
+        os.utime(path, (t, t))
+        return path
+
+    def test_in_flight_temp_file_is_kept(self):
+        tmp = self._file(".tmp-abc123")
+        old = self._file("aaaa_thumb.jpg", age=60)
+        removed = images.evict_cache(max_bytes=0)
+        self.assertEqual(removed, 1)
+        self.assertTrue(os.path.exists(tmp))
+        self.assertFalse(os.path.exists(old))
+
+    def test_stale_temp_file_is_removed(self):
+        tmp = self._file(".tmp-abc123", age=images.TMP_MAX_AGE + 60)
+        images.evict_cache(max_bytes=10 ** 9)
+        self.assertFalse(os.path.exists(tmp))
+
+    def test_live_keys_are_kept(self):
+        live = self._file("bbbb_card.jpg", age=120)
+        old = self._file("cccc.json", age=60)
+        images.evict_cache(max_bytes=0, keep=frozenset({"bbbb"}))
+        self.assertTrue(os.path.exists(live))
+        self.assertFalse(os.path.exists(old))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# test_scheduler.py
+"""
+Scheduler behaviour with stub sources: fetch timeouts, source priority and sink retries.
+
+Run from python-service/:  python -m unittest discover tests
+"""
+import datetime as dt
+import os
+import sys
+import threading
+import time
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from scheduler import Scheduler  # noqa: E402
+from sources import Source  # noqa: E402
+
+
+def article(link: str, title: str = "t", **extra) -> dict:
+    now = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return {"link": link, "title": title, "published_at": now, **extra}
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_timed_out_fetch_keeps_guard(self):
+        release = threading.Event()
+        in_flight = []
+        peak = []
+
+        def fetch():
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            release.wait(5)
+            in_flight.pop()
+            return [article("https://x/1")]
+
+        src = Source("slow", fetch, interval=60, timeout=0.1)
+        s = Scheduler([src])
+        self.assertEqual(s.run_source(src), 0)  # timed out
+        self.assertEqual(s.run_source(src), 0)  # guard still held: no second fetch
+        self.assertEqual(peak, [1])
+
+        release.set()
+        for _ in range(50):
+            if not s._running["slow"].locked():
+                break
+            time.sleep(0.02)
+        self.assertFalse(s._running["slow"].locked())
+        self.assertEqual(s.snapshot()[0], [])  # the abandoned result is dropped
+
+    def test_higher_priority_source_wins_merge(self):
+        spl = Source("spl", lambda: [article("https://x/1", "official")], interval=60, priority=0)
+        rss = Source("rss", lambda: [article("https://x/1", "feed")], interval=60, priority=5)
+        s = Scheduler([rss, spl])
+
+        s.run_source(spl)
+        self.assertEqual(s.run_source(rss), 0)
+        self.assertEqual([a["title"] for a in s.snapshot()[0]], ["official"])
+
+        # and the other way round: a later higher-priority source replaces the feed's copy
+        s = Scheduler([rss, spl])
+        s.run_source(rss)
+        self.assertEqual(s.run_source(spl), 1)
+        self.assertEqual([a["title"] for a in s.snapshot()[0]], ["official"])
+
+    def test_unchanged_refetch_keeps_processed_fields(self):
+        src = Source("rss", lambda: [article("https://x/1")], interval=60)
+
+        def process(items):
+            for a in items:
+                a["image_thumb"] = "/img/k/thumb.jpg"
+            return items
+
+        s = Scheduler([src], process=process)
+        self.assertEqual(s.run_source(src), 1)
+        self.assertEqual(s.run_source(src), 0)
+        self.assertEqual(s.snapshot()[0][0]["image_thumb"], "/img/k/thumb.jpg")
+
+    def test_failed_on_change_is_retried(self):
+        calls = []
+        fail = [True]
+
+        def on_change(items):
+            calls.append(sorted(a["link"] for a in items))
+            if fail[0]:
+                raise RuntimeError("db down")
+
+        items = [[article("https://x/1")], [article("https://x/2")], [article("https://x/2")]]
+        src = Source("rss", lambda: items.pop(0), interval=60)
+        s = Scheduler([src], on_change=on_change)
+
+        s.run_source(src)
+        fail[0] = False
+        s.run_source(src)
+        s.run_source(src)  # nothing new and nothing pending: no call
+        self.assertEqual(calls, [["https://x/1"], ["https://x/1", "https://x/2"]])
+
+    def test_flush_skips_while_another_is_running(self):
+        writing = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def on_change(items):
+            calls.append(sorted(a["link"] for a in items))
+            writing.set()
+            release.wait(5)
+
+        a = Source("a", lambda: [article("https://x/a")], interval=60)
+        b = Source("b", lambda: [article("https://x/b")], interval=60)
+        s = Scheduler([a, b], on_change=on_change)
+
+        t = threading.Thread(target=s.run_source, args=(a,))
+        t.start()
+        self.assertTrue(writing.wait(5))
+        started = time.time()
+        self.assertEqual(s.run_source(b), 1)  # does not wait on a's write
+        self.assertLess(time.time() - started, 1)
+        self.assertIn("https://x/b", {x["link"] for x in s.snapshot()[0]})
+
+        release.set()
+        t.join(5)
+        s._flush(b)  # b's article was left pending, not dropped
+        self.assertEqual(calls, [["https://x/a"], ["https://x/b"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# test_sink.py
+"""
+sink.write_articles against a temporary SQLite news table.
+
+Run from python-service/:  python -m unittest discover tests
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import sink  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE news (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR NOT NULL,
+    link VARCHAR NOT NULL,
+    description TEXT,
+    published_at DATETIME,
+    content TEXT,
+    image VARCHAR,
+    image_thumb VARCHAR,
+    image_card VARCHAR,
+    category VARCHAR,
+    created_at DATETIME,
+    updated_at DATETIME
+);
+CREATE UNIQUE INDEX news_link_unique ON news (link);
+"""
+
+
+def article(n: int, **extra) -> dict:
+    return {
+        "title": f"Title {n}", "link": f"https://x/{n}", "description": "d",
+        "published_at": "2026-10-18 10:00:00", "content": "<p>body</p>", **extra,
+    }
+
+
+class WriteArticlesTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        self.url = f"sqlite:///{self.path}"
+        with sqlite3.connect(self.path) as db:
+            db.executescript(SCHEMA)
+
+    def rows(self, sql: str = "SELECT link, title FROM news ORDER BY id") -> list:
+        with sqlite3.connect(self.path) as db:
+            return db.execute(sql).fetchall()
+
+    def test_chunked_upsert(self):
+        self.assertLessEqual(sink.CHUNK_SIZE * len(sink.COLUMNS), 999)
+        orig = sink.CHUNK_SIZE
+        sink.CHUNK_SIZE = 3
+        self.addCleanup(setattr, sink, "CHUNK_SIZE", orig)
+
+        self.assertEqual(sink.write_articles([article(n) for n in range(7)], url=self.url), 7)
+        self.assertEqual(len(self.rows()), 7)
+
+        # second pass: 3 updates and 2 inserts, duplicate links in one batch collapse to the last
+        batch = [article(n, title=f"New {n}") for n in range(5, 10)] + [article(9, title="Last 9")]
+        self.assertEqual(sink.write_articles(batch, url=self.url), 5)
+        got = dict(self.rows())
+        self.assertEqual(len(got), 10)
+        self.assertEqual(got["https://x/4"], "Title 4")
+        self.assertEqual(got["https://x/5"], "New 5")
+        self.assertEqual(got["https://x/9"], "Last 9")
+
+    def test_update_keeps_created_at(self):
+        sink.write_articles([article(1)], url=self.url)
+        with sqlite3.connect(self.path) as db:
+            db.execute("UPDATE news SET created_at = '2020-01-01 00:00:00', updated_at = '2020-01-01 00:00:00'")
+
+        sink.write_articles([article(1, title="Edited")], url=self.url)
+        (title, created, updated), = self.rows("SELECT title, created_at, updated_at FROM news")
+        self.assertEqual(title, "Edited")
+        self.assertEqual(created, "2020-01-01 00:00:00")
+        self.assertNotEqual(updated, "2020-01-01 00:00:00")
+
+    def test_block_pages_skipped(self):
+        written = sink.write_articles([
+            article(1),
+            article(2, title="Access Denied"),
+            article(3, content="<p>Please verify you are human</p>"),
+            article(4, title=""),
+        ], url=self.url)
+        self.assertEqual(written, 1)
+        self.assertEqual([link for link, _ in self.rows()], ["https://x/1"])
+
+    def test_relative_derivative_urls_not_stored(self):
+        sink.write_articles([
+            article(1, image="https://cdn/a.jpg", image_thumb="/img/k/thumb.jpg",
+                    image_card="https://news.example.com/img/k/card.jpg"),
+        ], url=self.url)
+        self.assertEqual(
+            self.rows("SELECT image, image_thumb, image_card FROM news"),
+            [("https://cdn/a.jpg", None, "https://news.example.com/img/k/card.jpg")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
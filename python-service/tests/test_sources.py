@@ -0,0 +1,39 @@
+# test_sources.py
+"""
+Feed source registration in sources.py.
+
+Run from python-service/:  python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import sources  # noqa: E402
+
+
+class FeedSourcesTest(unittest.TestCase):
+    def test_registered_names_are_unique(self):
+        names = [s.name for s in sources.SOURCES]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_same_host_feeds_get_unique_names(self):
+        made = sources.feed_sources([
+            "http://feeds.bbci.co.uk/sport/football/rss.xml",
+            "http://feeds.bbci.co.uk/sport/football/africa/rss.xml",
+            "https://example.com/a.xml",
+            "https://example.com/b.xml",
+        ])
+        # "bbc" is already registered from FEEDS
+        self.assertEqual([s.name for s in made], ["bbc-2", "bbc-3", "example.com", "example.com-2"])
+        self.assertEqual({s.interval for s in made[:2]}, {300})
+        registered = list(sources.SOURCES)
+        self.addCleanup(lambda: sources.SOURCES.__setitem__(slice(None), registered))
+        for s in made:
+            sources.register_source(s)  # no ValueError
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@ class News {
   final String? description;
   final String? content;
   final String? image;
+  final String? imageThumb; // resized copies served by the Python service
+  final String? imageCard;
   final DateTime publishedAt;
   final String? category; // ✅ NEW FIELD
 
@@ -13,6 +15,8 @@ class News {
     this.description,
     this.content,
     this.image,
+    this.imageThumb,
+    this.imageCard,
     required this.publishedAt,
     this.category, // ✅ include in constructor
   });
@@ -46,8 +50,16 @@ class News {
       description: json['description'],
       content: json['content'],
       image: json['image'],
+      imageThumb: json['image_thumb'],
+      imageCard: json['image_card'],
       publishedAt: published,
       category: json['category'], // ✅ parse category
     );
   }
+
+  // Prefer the resized copies; fall back to the original image.
+  String? get thumbUrl =>
+      (imageThumb != null && imageThumb!.isNotEmpty) ? imageThumb : image;
+  String? get cardUrl =>
+      (imageCard != null && imageCard!.isNotEmpty) ? imageCard : image;
 }
@@ -101,7 +101,7 @@ class NewsDetailPage extends StatelessWidget {
                       tag: heroTag,
                       child: hasImage
                           ? CachedNetworkImage(
-                              imageUrl: article.image!,
+                              imageUrl: article.cardUrl!,
                               cacheManager: CustomCacheManager.instance,
                               fit: BoxFit.cover,
                               placeholder: (c, u) =>
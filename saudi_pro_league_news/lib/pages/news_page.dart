@@ -151,7 +151,7 @@ class _NewsPageState extends State<NewsPage> {
           if (hasImage) {
             try {
               final provider = CachedNetworkImageProvider(
-                article.image!,
+                article.cardUrl!,
                 cacheManager: CustomCacheManager.instance,
               );
               await precacheImage(provider, context);
@@ -178,7 +178,7 @@ class _NewsPageState extends State<NewsPage> {
                           tag: heroTag,
                           child: hasImage
                               ? CachedNetworkImage(
-                                  imageUrl: article.image!,
+                                  imageUrl: article.thumbUrl!,
                                   cacheManager: CustomCacheManager.instance,
                                   fit: BoxFit.cover,
                                   placeholder: (c, u) =>